@@ -2,6 +2,17 @@
 from models.vector import Vector
 from models.sphere import Sphere
 from models.exceptions import *
+from models.cache import caching, cache_info, enable_cache, disable_cache
+from models.transform import AffineTransform
+from models.storage import PointStore, SphereStore
+from models.server import QueryServer, QueryClient, encode_request, OP_SCALAR_MULTIPLY, REQUEST_HEADER, RESPONSE, STATUS_OK, STATUS_ERROR
+import asyncio
+from contextlib import nullcontext
+import os
+import struct
+import tempfile
+import threading
+import math
 
 if __name__ == "__main__":
 
@@ -104,3 +115,183 @@ if __name__ == "__main__":
     except Exception as e:
         print(f"Исключение: {e}\n")
 
+    print("\n" + "_"*40 + "\n")
+    print("Проверки дополнительных модулей")
+
+    print("Проверка 1: Кэш и именованные аргументы")
+    for enabled in (False, True):
+        with caching(16) if enabled else nullcontext():
+            assert Vector.scalar_multiply(a=a, b=b) == Vector.scalar_multiply(a, b) == a * b
+            assert Vector.is_collinear(a=a, b=a * -2.001)
+            assert Vector.is_orthogonal(Vector([1, 1]), b=Vector([-1, 1]))
+            assert sphere.contains(point=point_c) == sphere.contains(point_c)
+            assert sphere.contains(point_d) is False
+    with caching(16):
+        Vector.scalar_multiply(a, b)
+        Vector.scalar_multiply(a=a, b=b)
+        assert cache_info()["Vector.scalar_multiply"].hits == 1
+        moved = Vector(a.end_point.values, [1, 1, 1, 1, 1])
+        assert Vector.scalar_multiply(moved, b) != Vector.scalar_multiply(a, b)
+        shifted = Sphere.from_length(1, 2)
+        assert shifted.contains(Point([0, 0]))
+        shifted.start_point = Point([5, 5])
+        assert not shifted.contains(Point([0, 0]))
+        Vector.is_orthogonal(Vector([1, 1]), Vector([-1, 1]))
+        assert cache_info()["Vector.is_orthogonal"].size == 1
+        assert cache_info()["Vector.scalar_multiply"].size == 2
+    assert cache_info() == {}
+    with caching(16) as outer:
+        with caching(16) as inner:
+            assert cache_info() == {} and len(inner) == 0
+        Vector.scalar_multiply(a, b)
+        assert len(outer) == 1 and len(inner) == 0
+    assert cache_info() == {}
+    process_cache = enable_cache(16)
+    seen_in_thread = []
+    with caching(16):
+        worker = threading.Thread(target=lambda: (Vector.scalar_multiply(a, b), seen_in_thread.append(len(process_cache))))
+        worker.start()
+        worker.join()
+    assert seen_in_thread == [1]
+    disable_cache()
+    print("Успех.\n")
+
+    print("Проверка 2: Аффинные преобразования")
+    transform = AffineTransform.compose(
+        AffineTransform.rotation(math.pi / 2, 3),
+        AffineTransform.scaling(2, 3),
+        AffineTransform.translation([1, 0, 0]),
+    )
+    moved_point, moved_vector, moved_sphere = transform.apply_many(
+        [Point([1, 0, 0]), Vector([1, 1, 0], [1, 0, 0]), Sphere.from_length(1, 3)]
+    )
+    assert all(math.isclose(x, y, abs_tol=1e-9) for x, y in zip(moved_point.values, [1, 2, 0]))
+    assert all(math.isclose(x, y, abs_tol=1e-9) for x, y in zip(moved_vector.end_point.values, [-1, 2, 0]))
+    assert moved_sphere == Sphere([1, 0, 2], [1, 0, 0])
+    assert transform @ AffineTransform.identity(3) == transform
+    try:
+        AffineTransform.scaling([1, 2, 3]).apply(Sphere.from_length(1, 3))
+        assert False, "Неравномерный масштаб сферы должен быть запрещён"
+    except ValueError:
+        pass
+    try:
+        AffineTransform.scaling([1e-5, 3e-5]).apply(Sphere([1.0, 0.0]))
+        assert False, "Малый неравномерный масштаб сферы должен быть запрещён"
+    except ValueError:
+        pass
+    assert AffineTransform.scaling(1e-5, 2).apply(Sphere([1.0, 0.0])).radius == 1e-5
+    assert AffineTransform.scaling(0, 2).uniform_scale() == 0.0
+    assert AffineTransform([[1, 0], [0, 0]]).uniform_scale() is None
+    print("Успех.\n")
+
+    print("Проверка 3: Хранилища в отображаемом в память файле")
+    with tempfile.TemporaryDirectory() as directory:
+        points_path = os.path.join(directory, "points.bin")
+        spheres_path = os.path.join(directory, "spheres.bin")
+
+        with PointStore.create(points_path, 3, capacity=2) as store:
+            assert store.extend(Point([i, i, i]) for i in range(10)) == range(10)
+            assert store.capacity >= 10
+            try:
+                store.extend([Point([1, 2, 3]), Point([1, 2])])
+                assert False, "Точка другой размерности должна быть отклонена"
+            except DimensionMismatchPointException:
+                pass
+            assert len(store) == 10
+            with store.coordinates(0) as column:
+                assert list(column) == [float(i) for i in range(10)]
+
+        with open(points_path, "rb") as raw:
+            raw.seek(64 + 8)
+            assert raw.read(8) == struct.pack("<d", 1.0)
+
+        with PointStore.open(points_path) as store:
+            assert len(store) == 10 and store[-1] == Point([9.0, 9.0, 9.0])
+            assert store.query_ball(Point([0, 0, 0]), 2 * 3 ** 0.5) == [0, 1, 2]
+            assert store.query_box([1, 1, 1], [3, 3, 3]) == [1, 2, 3]
+
+        far_sphere = Sphere([1.0, 1e16], [0.0, 1e16])
+        with SphereStore.create(spheres_path, 2, capacity=1) as store:
+            store.extend([Sphere.from_length(2, 2), Sphere([5, 5], [4, 4]), far_sphere])
+
+        with SphereStore.open(spheres_path) as store:
+            assert store[1] == Sphere([5, 5], [4, 4])
+            assert store[2] == far_sphere and store[2].radius == 1.0
+            assert store.containing(Point([4.5, 4.5])) == [1]
+            with store.radii() as radii:
+                assert list(radii) == [2.0, 2 ** 0.5, 1.0]
+    print("Успех.\n")
+
+    print("Проверка 4: Сервер проверок")
+    async def check_server():
+        server = QueryServer(window=0.01, max_pending=2)
+        host, port = (await server.start())[:2]
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+            for request_id in range(5):
+                writer.write(encode_request(OP_SCALAR_MULTIPLY, request_id, 2, [1.0, 2.0, 3.0, float(request_id)]))
+            writer.write_eof()
+            data = await reader.read()
+            writer.close()
+            responses = [RESPONSE.unpack_from(data, offset) for offset in range(0, len(data), RESPONSE.size)]
+            assert responses == [(request_id, STATUS_OK, 3.0 + 2 * request_id) for request_id in range(5)]
+
+            reader, writer = await asyncio.open_connection(host, port)
+            writer.write(REQUEST_HEADER.pack(OP_SCALAR_MULTIPLY, 7, 0))
+            writer.write_eof()
+            request_id, status, _ = RESPONSE.unpack(await reader.read())
+            writer.close()
+            assert (request_id, status) == (7, STATUS_ERROR)
+
+            client = QueryClient()
+            await client.connect(host, port)
+            points = [point_a, point_b, point_c, point_d]
+            remote = await asyncio.gather(*(client.contains(sphere, point) for point in points))
+            assert remote == [sphere.contains(point) for point in points]
+            assert await client.scalar_multiply(a, b) == Vector.scalar_multiply(a, b)
+            try:
+                await client.scalar_multiply(Vector([1.0] * 70000), Vector([1.0] * 70000))
+                assert False, "Размерность больше 65535 должна быть отклонена"
+            except ValueError:
+                pass
+            assert client._pending == {}
+
+            assert server.stats.summary()["requests"] == 10
+            server.stats.reset()
+            assert server.stats.summary()["requests"] == 0
+
+            idle_reader, idle_writer = await asyncio.open_connection(host, port)
+        finally:
+            await asyncio.wait_for(server.stop(), 5)
+        assert await idle_reader.read() == b""
+        idle_writer.close()
+        try:
+            await asyncio.wait_for(client.scalar_multiply(a, b), 5)
+            assert False, "Запрос после закрытия соединения должен завершаться ошибкой"
+        except ConnectionError:
+            pass
+        await client.close()
+    asyncio.run(check_server())
+    print("Успех.\n")
+
+    print("Проверка 5: Случайные точки в шаре и на сфере")
+    sample_sphere = Sphere([1, 2, 6], [1, 2, 3])
+    centre = sample_sphere.start_point.values
+    chunks = list(sample_sphere.sample_surface(10, chunk_size=4, seed=1))
+    assert [len(chunk) for chunk in chunks] == [12, 12, 6]
+    assert chunks == list(sample_sphere.sample_surface(10, chunk_size=4, seed=1))
+    surface = [x for chunk in chunks for x in chunk]
+    assert all(math.isclose(math.dist(surface[i:i + 3], centre), 3.0) for i in range(0, len(surface), 3))
+    inside = [x for chunk in sample_sphere.sample_inside(1000, seed=2) for x in chunk]
+    assert all(math.dist(inside[i:i + 3], centre) <= 3.0 for i in range(0, len(inside), 3))
+    try:
+        list(sample_sphere.sample_inside(True, chunk_size=True))
+        assert False, "bool не должен приниматься как количество точек"
+    except TypeError:
+        pass
+    for dimension in (3, 20):
+        estimate = Sphere.from_length(1, dimension).monte_carlo(20000, seed=3)
+        assert estimate == Sphere.from_length(1, dimension).monte_carlo(20000, seed=3)
+        assert estimate["standard_error"] > 0
+        assert estimate["volume_error"] < 0.05 and estimate["area_error"] < 0.05
+    print("Успех.\n")
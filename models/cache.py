@@ -0,0 +1,271 @@
+﻿from models.point import Point
+from collections import OrderedDict, namedtuple
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Callable, Dict, Optional
+import inspect
+import threading
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "size", "capacity"])
+
+DEFAULT_CAPACITY = 1024
+
+class LRUCache():
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        """
+        Создаёт LRU-кэш ограниченного размера со статистикой по функциям.
+
+        :param capacity: Максимальное количество хранимых результатов
+        :type capacity: int
+        :returns: LRUCache
+        :raises TypeError: Если размер кэша - не целое число.
+        :raises ValueError: Если размер кэша меньше единицы.
+        """
+        if not isinstance(capacity, int) or isinstance(capacity, bool):
+            raise TypeError("Размер кэша должен быть целочисленным значением")
+        if capacity < 1:
+            raise ValueError("Размер кэша должен быть >= 1")
+        self._capacity = capacity
+        self._data = OrderedDict()
+        self._hits = {}
+        self._misses = {}
+        self._lock = threading.Lock()
+
+    @property
+    def capacity(self):
+        """
+        Возвращает максимальный размер кэша.
+
+        :returns: int
+        """
+        return self._capacity
+
+    def __len__(self):
+        """
+        Возвращает количество хранимых результатов.
+
+        :returns: int
+        """
+        return len(self._data)
+
+    def get(self, name: str, key: tuple):
+        """
+        Ищет результат в кэше и обновляет статистику функции.
+
+        :param name: Имя функции
+        :type name: str
+        :param key: Ключ аргументов
+        :type key: tuple
+        :returns: (True, результат), если результат найден, иначе - (False, None)
+        """
+        with self._lock:
+            full_key = (name, key)
+            if full_key in self._data:
+                self._data.move_to_end(full_key)
+                self._hits[name] = self._hits.get(name, 0) + 1
+                return True, self._data[full_key]
+            self._misses[name] = self._misses.get(name, 0) + 1
+            return False, None
+
+    def put(self, name: str, key: tuple, value):
+        """
+        Сохраняет результат, вытесняя самый давно использованный при переполнении.
+
+        :param name: Имя функции
+        :type name: str
+        :param key: Ключ аргументов
+        :type key: tuple
+        :param value: Результат функции
+        """
+        with self._lock:
+            full_key = (name, key)
+            self._data[full_key] = value
+            self._data.move_to_end(full_key)
+            while len(self._data) > self._capacity:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """
+        Очищает кэш и статистику.
+        """
+        with self._lock:
+            self._data.clear()
+            self._hits.clear()
+            self._misses.clear()
+
+    def info(self) -> Dict[str, CacheInfo]:
+        """
+        Возвращает статистику попаданий/промахов по каждой функции.
+
+        :returns: Dict[str, CacheInfo]
+        """
+        with self._lock:
+            sizes = {}
+            for name, _ in self._data:
+                sizes[name] = sizes.get(name, 0) + 1
+            names = set(self._hits) | set(self._misses)
+            return {
+                name: CacheInfo(self._hits.get(name, 0), self._misses.get(name, 0), sizes.get(name, 0), self._capacity)
+                for name in sorted(names)
+            }
+
+
+# Кэш процесса (enable_cache) и кэш текущего контекста (caching). Кэш контекста
+# виден только в своём потоке/asyncio-задаче и имеет приоритет над кэшем процесса.
+_cache: Optional[LRUCache] = None
+_context_cache: ContextVar[Optional[LRUCache]] = ContextVar("models_cache", default=None)
+
+def _active_cache() -> Optional[LRUCache]:
+    """
+    Возвращает кэш текущего контекста, а если его нет - кэш процесса.
+
+    :returns: LRUCache или None, если кэширование выключено
+    """
+    cache = _context_cache.get()
+    return cache if cache is not None else _cache
+
+class _Key():
+    """
+    Ключ объекта с заранее вычисленным хэшем.
+
+    Поиск в кэше по тому же объекту-ключу сравнивает его по идентичности,
+    поэтому повторный вызов с теми же объектами не перебирает координаты.
+    """
+    __slots__ = ("content", "hash")
+
+    def __init__(self, content: tuple):
+        self.content = content
+        self.hash = hash(content)
+
+    def __hash__(self):
+        return self.hash
+
+    def __eq__(self, other):
+        return isinstance(other, _Key) and self.hash == other.hash and self.content == other.content
+
+def _key_of(object):
+    """
+    Строит ключ объекта по содержимому координат.
+
+    Ключ сохраняется в объекте вместе со start_point, для которой он построен:
+    при переназначении start_point (единственный публичный способ изменить
+    точку/вектор/сферу) ключ строится заново, а устаревший результат никогда
+    не возвращается.
+
+    :returns: _Key или None, если объект не является точкой
+    """
+    if not isinstance(object, Point):
+        return None
+    start_point = getattr(object, "start_point", None)
+    cached = object.__dict__.get("_cache_key")
+    if cached is not None and cached[0] is start_point:
+        return cached[1]
+
+    values = object._values
+    start_values = start_point._values if isinstance(start_point, Point) else ()
+    key = _Key((
+        type(object),
+        tuple(values), tuple(map(type, values)),
+        tuple(start_values), tuple(map(type, start_values)),
+    ))
+    object.__dict__["_cache_key"] = (start_point, key)
+    return key
+
+def memoized(name: str) -> Callable:
+    """
+    Декоратор, кэширующий результат функции от точек/векторов/сфер.
+
+    Пока кэш не включён (enable_cache/caching), функция вызывается напрямую.
+    Именованные аргументы приводятся к позиционным по сигнатуре функции.
+    Если какой-либо аргумент - не точка, кэш не используется и функция
+    сама выбрасывает соответствующее исключение.
+
+    :param name: Имя функции в статистике
+    :type name: str
+    :returns: Callable
+    """
+    def decorator(function):
+        signature = inspect.signature(function)
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            cache = _active_cache()
+            if cache is None:
+                return function(*args, **kwargs)
+            if kwargs:
+                try:
+                    bound = signature.bind(*args, **kwargs)
+                except TypeError:
+                    return function(*args, **kwargs)
+                bound.apply_defaults()
+                args = bound.args
+                if bound.kwargs:
+                    return function(*args, **bound.kwargs)
+            key = tuple(map(_key_of, args))
+            if None in key:
+                return function(*args)
+            found, value = cache.get(name, key)
+            if found:
+                return value
+            value = function(*args)
+            cache.put(name, key, value)
+            return value
+        return wrapper
+    return decorator
+
+def enable_cache(capacity: int = DEFAULT_CAPACITY) -> LRUCache:
+    """
+    Включает кэширование для всего процесса.
+
+    :param capacity: Максимальное количество хранимых результатов
+    :type capacity: int
+    :returns: LRUCache
+    """
+    global _cache
+    _cache = LRUCache(capacity)
+    return _cache
+
+def disable_cache():
+    """
+    Выключает кэширование для всего процесса.
+    """
+    global _cache
+    _cache = None
+
+def cache_clear():
+    """
+    Очищает текущий кэш, если он включён.
+    """
+    cache = _active_cache()
+    if cache is not None:
+        cache.clear()
+
+def cache_info() -> Dict[str, CacheInfo]:
+    """
+    Возвращает статистику текущего кэша (пустой словарь, если кэш выключен).
+
+    :returns: Dict[str, CacheInfo]
+    """
+    cache = _active_cache()
+    if cache is None:
+        return {}
+    return cache.info()
+
+@contextmanager
+def caching(capacity: int = DEFAULT_CAPACITY):
+    """
+    Контекстный менеджер: включает кэш на время блока только для текущего потока/asyncio-задачи.
+
+    Другие потоки и задачи продолжают использовать кэш процесса (enable_cache), если он включён.
+
+    :param capacity: Максимальное количество хранимых результатов
+    :type capacity: int
+    :returns: LRUCache
+    """
+    cache = LRUCache(capacity)
+    token = _context_cache.set(cache)
+    try:
+        yield cache
+    finally:
+        _context_cache.reset(token)
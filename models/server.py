@@ -0,0 +1,592 @@
+﻿from models.point import Point
+from models.vector import Vector
+from models.sphere import Sphere
+from models.exceptions import DimensionMismatchPointException
+from collections import deque
+from typing import Dict, List, Tuple
+import argparse
+import asyncio
+import itertools
+import math
+import random
+import struct
+import time
+
+OP_CONTAINS = 1
+OP_ON_SPHERE = 2
+OP_SCALAR_MULTIPLY = 3
+
+STATUS_OK = 0
+STATUS_ERROR = 1
+
+# Запрос: код операции, id запроса, размерность, затем float64-аргументы.
+# Ответ: id запроса, статус, результат (bool передаётся как 0.0/1.0).
+REQUEST_HEADER = struct.Struct("<BIH")
+RESPONSE = struct.Struct("<IBd")
+
+DEFAULT_WINDOW = 0.001
+DEFAULT_MAX_BATCH = 1024
+DEFAULT_MAX_PENDING = 4096
+DEFAULT_STOP_GRACE = 1.0
+MAX_DIMENSION = 0xFFFF
+
+def payload_size(op: int, dimension: int) -> int:
+    """
+    Возвращает количество чисел в аргументах операции.
+
+    :param op: Код операции
+    :type op: int
+    :param dimension: Размерность
+    :type dimension: int
+    :returns: int
+    :raises ValueError: Если код операции неизвестен.
+    """
+    if op in (OP_CONTAINS, OP_ON_SPHERE):
+        return 2 * dimension + 1
+    if op == OP_SCALAR_MULTIPLY:
+        return 2 * dimension
+    raise ValueError(f"Неизвестный код операции: {op}")
+
+def encode_request(op: int, request_id: int, dimension: int, payload: List[float]) -> bytes:
+    """
+    Кодирует запрос.
+
+    :returns: bytes
+    :raises ValueError: Если код операции неизвестен или размерность вне диапазона 1..65535.
+    :raises DimensionMismatchPointException: Если количество аргументов не соответствует размерности.
+    """
+    if not 1 <= dimension <= MAX_DIMENSION:
+        raise ValueError(f"Размерность запроса должна быть от 1 до {MAX_DIMENSION}")
+    if len(payload) != payload_size(op, dimension):
+        raise DimensionMismatchPointException(message="Количество аргументов не соответствует размерности запроса")
+    return REQUEST_HEADER.pack(op, request_id, dimension) + struct.pack(f"<{len(payload)}d", *payload)
+
+#region Пакетные ядра
+def _contains_batch(rows: List[Tuple[int, tuple]]) -> List[float]:
+    result = []
+    for dimension, payload in rows:
+        centre, radius, point = payload[:dimension], payload[dimension], payload[dimension + 1:]
+        distance = math.dist(centre, point)
+        inside = distance < radius or math.isclose(distance, radius, rel_tol=1e-9, abs_tol=1e-9)
+        result.append(1.0 if inside else 0.0)
+    return result
+
+def _on_sphere_batch(rows: List[Tuple[int, tuple]]) -> List[float]:
+    result = []
+    for dimension, payload in rows:
+        centre, radius, point = payload[:dimension], payload[dimension], payload[dimension + 1:]
+        distance = math.dist(centre, point)
+        result.append(1.0 if math.isclose(distance, radius, rel_tol=1e-9, abs_tol=1e-9) else 0.0)
+    return result
+
+def _scalar_multiply_batch(rows: List[Tuple[int, tuple]]) -> List[float]:
+    return [sum(x * y for x, y in zip(payload[:dimension], payload[dimension:])) for dimension, payload in rows]
+
+KERNELS = {
+    OP_CONTAINS: _contains_batch,
+    OP_ON_SPHERE: _on_sphere_batch,
+    OP_SCALAR_MULTIPLY: _scalar_multiply_batch,
+}
+#endregion
+
+def percentile(values: List[float], fraction: float) -> float:
+    """
+    Возвращает перцентиль (методом ближайшего ранга).
+
+    :param values: Отсортированные значения
+    :type values: List[float]
+    :param fraction: Доля (0.5 - медиана, 0.99 - p99)
+    :type fraction: float
+    :returns: float (nan для пустого списка)
+    """
+    if len(values) == 0:
+        return math.nan
+    index = min(len(values) - 1, max(0, math.ceil(fraction * len(values)) - 1))
+    return values[index]
+
+class LatencyStats():
+    def __init__(self, window: int = 100000):
+        """
+        Создаёт накопитель задержек и пропускной способности.
+
+        :param window: Количество последних задержек, по которым считаются перцентили
+        :type window: int
+        :returns: LatencyStats
+        """
+        self._latencies = deque(maxlen=window)
+        self.reset()
+
+    def reset(self):
+        """
+        Сбрасывает накопленные задержки и счётчики и начинает новый интервал измерения.
+        """
+        self._latencies.clear()
+        self._requests = 0
+        self._batches = 0
+        self._started = time.perf_counter()
+
+    def record_batch(self, latencies: List[float]):
+        """
+        Учитывает задержки (в секундах) запросов одного пакета.
+        """
+        self._latencies.extend(latencies)
+        self._requests += len(latencies)
+        self._batches += 1
+
+    def summary(self) -> Dict[str, float]:
+        """
+        Возвращает p50/p99 задержки (в миллисекундах), пропускную способность и средний размер пакета.
+
+        Все значения относятся к интервалу с момента создания или последнего reset.
+
+        :returns: Dict[str, float]
+        """
+        elapsed = time.perf_counter() - self._started
+        ordered = sorted(self._latencies)
+        return {
+            "requests": self._requests,
+            "batches": self._batches,
+            "mean_batch": self._requests / self._batches if self._batches else 0.0,
+            "p50_ms": percentile(ordered, 0.5) * 1000,
+            "p99_ms": percentile(ordered, 0.99) * 1000,
+            "throughput_rps": self._requests / elapsed if elapsed > 0 else 0.0,
+        }
+
+class MicroBatcher():
+    def __init__(self, window: float = DEFAULT_WINDOW, max_batch: int = DEFAULT_MAX_BATCH, stats: LatencyStats = None):
+        """
+        Собирает одновременные запросы в пакеты и вычисляет их пакетными ядрами.
+
+        Пакет отправляется, когда с момента первого запроса прошло window секунд
+        или накопилось max_batch запросов.
+
+        :param window: Окно ожидания в секундах
+        :type window: float
+        :param max_batch: Максимальный размер пакета
+        :type max_batch: int
+        :param stats: Накопитель статистики
+        :type stats: LatencyStats
+        :returns: MicroBatcher
+        :raises ValueError: Если окно отрицательное или размер пакета меньше единицы.
+        """
+        if window < 0:
+            raise ValueError("Окно ожидания не может быть отрицательным")
+        if max_batch < 1:
+            raise ValueError("Размер пакета должен быть >= 1")
+        self.window = window
+        self.max_batch = max_batch
+        self.stats = stats if stats is not None else LatencyStats()
+        self._queue = None
+        self._task = None
+
+    def start(self):
+        """
+        Запускает цикл обработки пакетов в текущем event loop.
+        """
+        self._queue = asyncio.Queue()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """
+        Останавливает цикл обработки пакетов. Запросы, оставшиеся в очереди, отменяются.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        while self._queue is not None and not self._queue.empty():
+            self._queue.get_nowait()[3].cancel()
+
+    def submit(self, op: int, dimension: int, payload: tuple) -> asyncio.Future:
+        """
+        Ставит запрос в очередь.
+
+        :returns: asyncio.Future с результатом (float)
+        """
+        future = asyncio.get_running_loop().create_future()
+        if self._task is None:
+            future.cancel()
+            return future
+        self._queue.put_nowait((op, dimension, payload, future, time.perf_counter()))
+        return future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.window
+            try:
+                while len(batch) < self.max_batch:
+                    while len(batch) < self.max_batch and not self._queue.empty():
+                        batch.append(self._queue.get_nowait())
+                    remaining = deadline - loop.time()
+                    if len(batch) >= self.max_batch or remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+            except asyncio.CancelledError:
+                for item in batch:
+                    item[3].cancel()
+                raise
+            self._evaluate(batch)
+
+    def _evaluate(self, batch: list):
+        groups = {}
+        for item in batch:
+            groups.setdefault(item[0], []).append(item)
+        for op, items in groups.items():
+            try:
+                results = KERNELS[op]([(dimension, payload) for _, dimension, payload, _, _ in items])
+            except Exception as error:
+                for _, _, _, future, _ in items:
+                    if not future.done():
+                        future.set_exception(error)
+                continue
+            for (_, _, _, future, _), value in zip(items, results):
+                if not future.done():
+                    future.set_result(value)
+        finished = time.perf_counter()
+        self.stats.record_batch([finished - item[4] for item in batch])
+
+class QueryServer():
+    def __init__(self, window: float = DEFAULT_WINDOW, max_batch: int = DEFAULT_MAX_BATCH, max_pending: int = DEFAULT_MAX_PENDING):
+        """
+        Создаёт asyncio-сервер проверок (contains, on_sphere, scalar_multiply) с микропакетированием.
+
+        :param window: Окно ожидания пакета в секундах
+        :type window: float
+        :param max_batch: Максимальный размер пакета
+        :type max_batch: int
+        :param max_pending: Максимальное количество незавершённых запросов одного соединения
+        :type max_pending: int
+        :returns: QueryServer
+        :raises ValueError: Если max_pending меньше единицы.
+        """
+        if max_pending < 1:
+            raise ValueError("Количество незавершённых запросов должно быть >= 1")
+        self.batcher = MicroBatcher(window, max_batch)
+        self.max_pending = max_pending
+        self._server = None
+        self._connections = {}
+
+    @property
+    def stats(self) -> LatencyStats:
+        """
+        Возвращает статистику сервера.
+
+        :returns: LatencyStats
+        """
+        return self.batcher.stats
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0, path: str = None):
+        """
+        Запускает сервер на TCP (localhost) или Unix-сокете.
+
+        :param host: Адрес TCP
+        :type host: str
+        :param port: Порт TCP (0 - любой свободный)
+        :type port: int
+        :param path: Путь к Unix-сокету (если указан, TCP не используется)
+        :type path: str
+        :returns: Адрес, на котором слушает сервер
+        """
+        self.batcher.start()
+        if path is not None:
+            self._server = await asyncio.start_unix_server(self._handle, path=path)
+        else:
+            self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server.sockets[0].getsockname()
+
+    async def stop(self, grace: float = DEFAULT_STOP_GRACE):
+        """
+        Останавливает сервер и закрывает все открытые соединения.
+
+        Незавершённые запросы получают STATUS_ERROR. Соединения, которые не успели
+        закрыться за grace секунд (например, клиент не читает ответы), обрываются.
+
+        :param grace: Время ожидания закрытия соединений в секундах
+        :type grace: float
+        """
+        if self._server is not None:
+            self._server.close()
+        await self.batcher.stop()
+
+        handlers = list(self._connections)
+        for writer in self._connections.values():
+            writer.close()
+        if handlers:
+            _, unfinished = await asyncio.wait(handlers, timeout=grace)
+            for handler in unfinished:
+                self._connections[handler].transport.abort()
+            await asyncio.gather(*handlers, return_exceptions=True)
+
+        if self._server is not None:
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        # Незавершённые запросы соединения: ответы на них отправляются и после
+        # закрытия клиентом своей стороны, а семафор ограничивает их количество.
+        pending = set()
+        limit = asyncio.Semaphore(self.max_pending)
+        handler = asyncio.current_task()
+        self._connections[handler] = writer
+        try:
+            while True:
+                op, request_id, dimension = REQUEST_HEADER.unpack(await reader.readexactly(REQUEST_HEADER.size))
+                try:
+                    if dimension < 1:
+                        raise ValueError("Размерность запроса должна быть >= 1")
+                    count = payload_size(op, dimension)
+                except ValueError:
+                    writer.write(RESPONSE.pack(request_id, STATUS_ERROR, math.nan))
+                    break
+                payload = struct.unpack(f"<{count}d", await reader.readexactly(count * 8))
+                await limit.acquire()
+                future = self.batcher.submit(op, dimension, payload)
+                pending.add(future)
+                future.add_done_callback(
+                    lambda done, request_id=request_id: self._respond(writer, request_id, done, pending, limit)
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+            try:
+                await writer.drain()
+            except ConnectionError:
+                pass
+            writer.close()
+            self._connections.pop(handler, None)
+
+    @staticmethod
+    def _respond(writer: asyncio.StreamWriter, request_id: int, future: asyncio.Future, pending: set, limit: asyncio.Semaphore):
+        pending.discard(future)
+        limit.release()
+        if writer.is_closing():
+            return
+        if future.cancelled() or future.exception() is not None:
+            writer.write(RESPONSE.pack(request_id, STATUS_ERROR, math.nan))
+        else:
+            writer.write(RESPONSE.pack(request_id, STATUS_OK, future.result()))
+
+class QueryClient():
+    def __init__(self):
+        """
+        Создаёт клиента сервера проверок. Поддерживает конвейерные (одновременные) запросы.
+
+        :returns: QueryClient
+        """
+        self._reader = None
+        self._writer = None
+        self._pending = {}
+        self._ids = itertools.count()
+        self._listener = None
+        self._closed = False
+
+    async def connect(self, host: str = "127.0.0.1", port: int = 0, path: str = None):
+        """
+        Подключается к серверу по TCP или Unix-сокету.
+        """
+        if path is not None:
+            self._reader, self._writer = await asyncio.open_unix_connection(path)
+        else:
+            self._reader, self._writer = await asyncio.open_connection(host, port)
+        self._listener = asyncio.get_running_loop().create_task(self._listen())
+
+    async def close(self):
+        """
+        Закрывает соединение.
+        """
+        self._closed = True
+        if self._writer is not None:
+            self._writer.close()
+            await self._writer.wait_closed()
+        if self._listener is not None:
+            await asyncio.gather(self._listener, return_exceptions=True)
+
+    async def _listen(self):
+        try:
+            while True:
+                request_id, status, value = RESPONSE.unpack(await self._reader.readexactly(RESPONSE.size))
+                future = self._pending.pop(request_id, None)
+                if future is None or future.done():
+                    continue
+                if status == STATUS_OK:
+                    future.set_result(value)
+                else:
+                    future.set_exception(RuntimeError(f"Сервер не смог выполнить запрос {request_id}"))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._closed = True
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("Соединение с сервером закрыто"))
+            self._pending.clear()
+
+    async def request(self, op: int, dimension: int, payload: List[float]) -> float:
+        """
+        Отправляет запрос и ждёт ответа.
+
+        :returns: float
+        :raises ConnectionError: Если клиент не подключён или соединение уже закрыто.
+        :raises ValueError: Если код операции неизвестен или размерность вне диапазона 1..65535.
+        :raises DimensionMismatchPointException: Если количество аргументов не соответствует размерности.
+        """
+        if self._writer is None or self._closed or self._writer.is_closing():
+            raise ConnectionError("Соединение с сервером закрыто")
+        request_id = next(self._ids) & 0xFFFFFFFF
+        frame = encode_request(op, request_id, dimension, payload)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        self._writer.write(frame)
+        return await future
+
+    async def contains(self, sphere: Sphere, point: Point) -> bool:
+        """
+        Удалённый аналог Sphere.contains.
+
+        :returns: bool
+        :raises TypeError: Если типы аргументов - не сфера и точка.
+        :raises DimensionMismatchPointException: Если размерности не совпадают.
+        """
+        return await self._sphere_request(OP_CONTAINS, sphere, point) == 1.0
+
+    async def on_sphere(self, sphere: Sphere, point: Point) -> bool:
+        """
+        Удалённый аналог Sphere.on_sphere.
+
+        :returns: bool
+        :raises TypeError: Если типы аргументов - не сфера и точка.
+        :raises DimensionMismatchPointException: Если размерности не совпадают.
+        """
+        return await self._sphere_request(OP_ON_SPHERE, sphere, point) == 1.0
+
+    async def scalar_multiply(self, a: Vector, b: Vector) -> float:
+        """
+        Удалённый аналог Vector.scalar_multiply.
+
+        :returns: float
+        :raises TypeError: Если типы объектов - не Вектор.
+        :raises DimensionMismatchPointException: Если размерность векторов не совпадает.
+        """
+        if not isinstance(a, Vector) or not isinstance(b, Vector):
+            raise TypeError("Невозможно произвести операцию скалярного умножения без объекта типа Vector")
+        if a.dimension != b.dimension:
+            raise DimensionMismatchPointException(message="Невозможно провести скалярное произведение из-за несоответствия размерностей.")
+        return await self.request(OP_SCALAR_MULTIPLY, a.dimension, a.values + b.values)
+
+    async def _sphere_request(self, op: int, sphere: Sphere, point: Point) -> float:
+        if not isinstance(sphere, Sphere) or type(point) is not Point:
+            raise TypeError(f"Невозможно выполнить проверку для объектов типа ({type(sphere)}, {type(point)})")
+        if point.dimension != sphere.dimension:
+            raise DimensionMismatchPointException(message="Размерность точки и сферы должны совпадать")
+        return await self.request(op, sphere.dimension, sphere.start_point.values + [sphere.radius] + point.values)
+
+async def run_load(host: str = "127.0.0.1", port: int = 0, path: str = None, requests: int = 10000,
+                   concurrency: int = 64, connections: int = 4, dimension: int = 3, seed: int = None) -> Dict[str, float]:
+    """
+    Генератор нагрузки: отправляет случайные запросы contains/on_sphere/scalar_multiply.
+
+    :param requests: Общее количество запросов
+    :type requests: int
+    :param concurrency: Количество одновременных запросов
+    :type concurrency: int
+    :param connections: Количество соединений
+    :type connections: int
+    :param dimension: Размерность объектов
+    :type dimension: int
+    :param seed: Зерно генератора случайных чисел
+    :type seed: int
+    :returns: Dict[str, float] - клиентские p50/p99 (мс) и пропускная способность
+    """
+    rng = random.Random(seed)
+    clients = []
+    for _ in range(connections):
+        client = QueryClient()
+        await client.connect(host, port, path)
+        clients.append(client)
+
+    sphere = Sphere.from_length(1.0, dimension)
+    remaining = itertools.count()
+    latencies = []
+
+    async def worker(client: QueryClient):
+        while next(remaining) < requests:
+            point = Point([rng.uniform(-1.5, 1.5) for _ in range(dimension)])
+            kind = rng.randrange(3)
+            started = time.perf_counter()
+            if kind == 0:
+                await client.contains(sphere, point)
+            elif kind == 1:
+                await client.on_sphere(sphere, point)
+            else:
+                await client.scalar_multiply(Vector(point.values), Vector(sphere.end_point.values))
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(clients[i % connections]) for i in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    for client in clients:
+        await client.close()
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "p50_ms": percentile(latencies, 0.5) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "throughput_rps": len(latencies) / elapsed if elapsed > 0 else 0.0,
+    }
+
+async def _serve_forever(args):
+    server = QueryServer(args.window, args.max_batch, args.max_pending)
+    address = await server.start(args.host, args.port, args.path)
+    print(f"Сервер слушает {address}")
+    try:
+        while True:
+            await asyncio.sleep(args.report)
+            print(server.stats.summary())
+            server.stats.reset()
+    finally:
+        await server.stop()
+
+async def _bench(args):
+    server = None
+    host, port, path = args.host, args.port, args.path
+    if port == 0 and path is None:
+        server = QueryServer(args.window, args.max_batch, args.max_pending)
+        host, port = (await server.start(host, 0))[:2]
+    result = await run_load(host, port, path, args.requests, args.concurrency, args.connections, args.dimension, args.seed)
+    print(f"Клиент: {result}")
+    if server is not None:
+        print(f"Сервер: {server.stats.summary()}")
+        await server.stop()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Сервер проверок сфер/векторов с микропакетированием")
+    parser.add_argument("mode", choices=["serve", "bench"])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--path", default=None, help="Путь к Unix-сокету")
+    parser.add_argument("--window", type=float, default=DEFAULT_WINDOW, help="Окно пакета в секундах")
+    parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH)
+    parser.add_argument("--max-pending", type=int, default=DEFAULT_MAX_PENDING, help="Лимит незавершённых запросов на соединение")
+    parser.add_argument("--report", type=float, default=5.0, help="Период вывода статистики сервера (с)")
+    parser.add_argument("--requests", type=int, default=10000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--connections", type=int, default=4)
+    parser.add_argument("--dimension", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    try:
+        asyncio.run(_serve_forever(args) if args.mode == "serve" else _bench(args))
+    except KeyboardInterrupt:
+        pass
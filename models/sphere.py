@@ -1,8 +1,32 @@
 ﻿from models.vector import Vector
 from models.point import Point
 from models.exceptions import DimensionMismatchPointException
-from typing import List, Self, Union
+from models.cache import memoized
+from typing import Dict, Iterator, List, Self, Union
+from array import array
 import math
+import random
+import warnings
+
+DEFAULT_CHUNK_SIZE = 65536
+
+def _check_sample_size(count: int, chunk_size: int):
+    """
+    Проверяет количество точек и размер пакета для генераторов случайных точек.
+
+    :param count: Количество точек
+    :type count: int
+    :param chunk_size: Размер пакета
+    :type chunk_size: int
+    :raises TypeError: Если количество или размер пакета - не целые числа (bool не допускается).
+    :raises ValueError: Если количество отрицательное или размер пакета меньше единицы.
+    """
+    if any(not isinstance(value, int) or isinstance(value, bool) for value in (count, chunk_size)):
+        raise TypeError("Количество точек и размер пакета должны быть целочисленными значениями")
+    if count < 0:
+        raise ValueError("Количество точек не может быть отрицательным")
+    if chunk_size < 1:
+        raise ValueError("Размер пакета должен быть >= 1")
 
 class Sphere(Vector):
     def __init__(self, end_cords: List[float], start_cords: List[float] = None):
@@ -20,6 +44,7 @@ class Sphere(Vector):
         super().__init__(end_cords, start_cords)
 
     #region Проверки на содержание
+    @memoized("Sphere.contains")
     def contains(self, point: Point):
         """
         Проверяет содержится ли в шаре точка.
@@ -103,6 +128,143 @@ class Sphere(Vector):
 
     #endregion
 
+    #region Случайные точки
+    def sample_surface(self, count: int, chunk_size: int = DEFAULT_CHUNK_SIZE, seed: int = None) -> Iterator[array]:
+        """
+        Генерирует равномерно распределённые точки на сфере (нормировка гауссовского вектора).
+
+        Точки выдаются пакетами: плоский буфер array('d') из chunk_size * dimension координат
+        (последний пакет может быть меньше).
+
+        :param count: Общее количество точек
+        :type count: int
+        :param chunk_size: Количество точек в одном пакете
+        :type chunk_size: int
+        :param seed: Зерно генератора случайных чисел
+        :type seed: int
+        :returns: Iterator[array]
+        :raises TypeError: Если количество или размер пакета - не целые числа.
+        :raises ValueError: Если количество отрицательное или размер пакета меньше единицы.
+        """
+        return self._sample(count, chunk_size, seed, inside=False)
+
+    def sample_inside(self, count: int, chunk_size: int = DEFAULT_CHUNK_SIZE, seed: int = None) -> Iterator[array]:
+        """
+        Генерирует равномерно распределённые точки внутри шара (направление * R * U^(1/n)).
+
+        Точки выдаются пакетами: плоский буфер array('d') из chunk_size * dimension координат
+        (последний пакет может быть меньше).
+
+        :param count: Общее количество точек
+        :type count: int
+        :param chunk_size: Количество точек в одном пакете
+        :type chunk_size: int
+        :param seed: Зерно генератора случайных чисел
+        :type seed: int
+        :returns: Iterator[array]
+        :raises TypeError: Если количество или размер пакета - не целые числа.
+        :raises ValueError: Если количество отрицательное или размер пакета меньше единицы.
+        """
+        return self._sample(count, chunk_size, seed, inside=True)
+
+    def _sample(self, count: int, chunk_size: int, seed: int, inside: bool) -> Iterator[array]:
+        _check_sample_size(count, chunk_size)
+        rng = random.Random(seed)
+        gauss = rng.gauss
+        uniform = rng.random
+        n = self.dimension
+        R = self.radius
+        centre = self.start_point.values
+        exponent = 1 / n
+
+        def generate():
+            remaining = count
+            while remaining > 0:
+                size = min(chunk_size, remaining)
+                buffer = array("d")
+                for _ in range(size):
+                    direction = [gauss(0.0, 1.0) for _ in range(n)]
+                    norm = math.hypot(*direction)
+                    while norm == 0.0:
+                        direction = [gauss(0.0, 1.0) for _ in range(n)]
+                        norm = math.hypot(*direction)
+                    scale = (R * uniform() ** exponent if inside else R) / norm
+                    buffer.extend([c + d * scale for c, d in zip(centre, direction)])
+                remaining -= size
+                yield buffer
+        return generate()
+
+    def monte_carlo(self, samples: int, chunk_size: int = DEFAULT_CHUNK_SIZE, seed: int = None) -> Dict[str, float]:
+        """
+        Оценивает объем шара методом Монте-Карло и сверяет с volume/area.
+
+        Используется выборка по значимости из изотропного гауссовского распределения
+        с центром в центре шара и sigma = R / sqrt(n + 1): почти все точки ложатся
+        у поверхности шара, поэтому доля попаданий не падает с ростом размерности
+        (в отличие от попаданий в описанный куб). Объем - среднее значение 1 / p(x)
+        по попавшим в шар точкам. Площадь оценивается через area = n * volume / R.
+
+        :param samples: Количество случайных точек
+        :type samples: int
+        :param chunk_size: Количество точек, генерируемых за раз
+        :type chunk_size: int
+        :param seed: Зерно генератора случайных чисел
+        :type seed: int
+        :returns: Dict[str, float] - оценки, точные значения, стандартная ошибка, число попаданий и относительные погрешности
+        :raises TypeError: Если количество или размер пакета - не целые числа.
+        :raises ValueError: Если количество точек меньше единицы.
+        """
+        _check_sample_size(samples, chunk_size)
+        if samples < 1:
+            raise ValueError("Количество точек должно быть >= 1")
+        rng = random.Random(seed)
+        gauss = rng.gauss
+        n = self.dimension
+        R = self.radius
+        R2 = R * R
+        volume = self.volume()
+        area = self.area()
+
+        hits = 0
+        total = 0.0
+        total_squares = 0.0
+        if R > 0:
+            sigma = R / math.sqrt(n + 1)
+            double_variance = 2 * sigma * sigma
+            log_norm = n / 2 * math.log(math.pi * double_variance)
+            remaining = samples
+            while remaining > 0:
+                size = min(chunk_size, remaining)
+                for _ in range(size):
+                    square = sum(gauss(0.0, sigma) ** 2 for _ in range(n))
+                    if square <= R2:
+                        weight = math.exp(log_norm + square / double_variance)
+                        hits += 1
+                        total += weight
+                        total_squares += weight * weight
+                remaining -= size
+
+        volume_estimate = total / samples
+        if hits == 0:
+            standard_error = 0.0 if R == 0 else math.inf
+            if R > 0:
+                warnings.warn("Ни одна точка не попала в шар: оценка объема недостоверна", RuntimeWarning)
+        else:
+            variance = max(total_squares / samples - volume_estimate ** 2, 0.0)
+            standard_error = math.sqrt(variance / samples)
+        area_estimate = n * volume_estimate / R if R > 0 else 0.0
+        return {
+            "volume_estimate": volume_estimate,
+            "volume": volume,
+            "volume_error": abs(volume_estimate - volume) / volume if volume > 0 else 0.0,
+            "standard_error": standard_error,
+            "hits": hits,
+            "area_estimate": area_estimate,
+            "area": area,
+            "area_error": abs(area_estimate - area) / area if area > 0 else 0.0,
+        }
+    #endregion
+
     #region Блокировка операций
     def __add__(self, object): 
         raise TypeError("Операция сложения для Sphere запрещена")
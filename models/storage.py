@@ -0,0 +1,429 @@
+﻿from models.point import Point
+from models.sphere import Sphere
+from models.exceptions import DimensionMismatchPointException
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Union
+import math
+import mmap
+import struct
+import sys
+
+_MAGIC = b"AIPGEOST"
+_HEADER = struct.Struct("<8sB3xIQQ")
+_HEADER_SIZE = 64
+_DOUBLE = struct.Struct("<d")
+_ITEM_SIZE = _DOUBLE.size
+
+_KIND_POINT = 1
+_KIND_SPHERE = 2
+
+DEFAULT_CAPACITY = 1024
+
+def _check_byte_order():
+    """
+    Проверяет, что порядок байт машины совпадает с форматом файла (little-endian).
+
+    :raises OSError: Если машина не little-endian.
+    """
+    if sys.byteorder != "little":
+        raise OSError("Хранилища поддерживаются только на little-endian машинах")
+
+class _ColumnStore():
+    """
+    Общая часть хранилищ: заголовок и колонки float64 в отображаемом в память файле.
+
+    Формат файла: заголовок (магическое число, тип записей, размерность,
+    количество, ёмкость), затем колонки по capacity чисел каждая.
+    Заголовок и колонки всегда little-endian; колонки отдаются как memoryview
+    без копирования, поэтому хранилища работают только на little-endian машинах.
+    """
+    _kind = 0
+
+    def __init__(self, path: str, file, mapping: mmap.mmap, dimension: int, count: int, capacity: int):
+        self._path = path
+        self._file = file
+        self._mapping = mapping
+        self._dimension = dimension
+        self._count = count
+        self._capacity = capacity
+
+    #region Открытие и закрытие
+    @classmethod
+    def _columns_for(cls, dimension: int) -> int:
+        return dimension
+
+    @classmethod
+    def create(cls, path: str, dimension: int, capacity: int = DEFAULT_CAPACITY):
+        """
+        Создаёт новое (пустое) хранилище, перезаписывая файл.
+
+        :param path: Путь к файлу
+        :type path: str
+        :param dimension: Размерность хранимых объектов
+        :type dimension: int
+        :param capacity: Начальная ёмкость (количество записей)
+        :type capacity: int
+        :returns: Хранилище
+        :raises TypeError: Если размерность или ёмкость - не целые числа.
+        :raises ValueError: Если размерность или ёмкость меньше единицы.
+        :raises OSError: Если машина не little-endian.
+        """
+        _check_byte_order()
+        if not isinstance(dimension, int) or not isinstance(capacity, int):
+            raise TypeError("Размерность и ёмкость должны быть целочисленными значениями")
+        if dimension < 1 or capacity < 1:
+            raise ValueError("Размерность и ёмкость должны быть >= 1")
+
+        file = open(path, "w+b")
+        file.truncate(_HEADER_SIZE + cls._columns_for(dimension) * capacity * _ITEM_SIZE)
+        mapping = mmap.mmap(file.fileno(), 0)
+        store = cls(path, file, mapping, dimension, 0, capacity)
+        store._write_header()
+        return store
+
+    @classmethod
+    def open(cls, path: str):
+        """
+        Открывает существующее хранилище. Данные не читаются, только заголовок.
+
+        :param path: Путь к файлу
+        :type path: str
+        :returns: Хранилище
+        :raises ValueError: Если файл - не хранилище нужного типа или повреждён.
+        :raises OSError: Если машина не little-endian.
+        """
+        _check_byte_order()
+        file = open(path, "r+b")
+        try:
+            mapping = mmap.mmap(file.fileno(), 0)
+        except ValueError:
+            file.close()
+            raise ValueError(f"Файл {path} пуст и не является хранилищем")
+
+        if len(mapping) < _HEADER_SIZE:
+            mapping.close()
+            file.close()
+            raise ValueError(f"Файл {path} не является хранилищем")
+        magic, kind, dimension, count, capacity = _HEADER.unpack_from(mapping, 0)
+        if magic != _MAGIC or kind != cls._kind:
+            mapping.close()
+            file.close()
+            raise ValueError(f"Файл {path} не является хранилищем типа {cls.__name__}")
+        if count > capacity or len(mapping) < _HEADER_SIZE + cls._columns_for(dimension) * capacity * _ITEM_SIZE:
+            mapping.close()
+            file.close()
+            raise ValueError(f"Файл {path} повреждён")
+        return cls(path, file, mapping, dimension, count, capacity)
+
+    def flush(self):
+        """
+        Сбрасывает изменения на диск.
+        """
+        self._mapping.flush()
+
+    def close(self):
+        """
+        Закрывает хранилище.
+
+        :raises BufferError: Если остались неосвобождённые представления колонок.
+        """
+        if self._mapping.closed:
+            return
+        self._mapping.flush()
+        self._mapping.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+    #endregion
+
+    #region Свойства хранилища
+    @property
+    def path(self):
+        """
+        Возвращает путь к файлу хранилища.
+
+        :returns: str
+        """
+        return self._path
+
+    @property
+    def dimension(self):
+        """
+        Возвращает размерность хранимых объектов.
+
+        :returns: int
+        """
+        return self._dimension
+
+    @property
+    def capacity(self):
+        """
+        Возвращает текущую ёмкость файла (в записях).
+
+        :returns: int
+        """
+        return self._capacity
+
+    def __len__(self):
+        """
+        Возвращает количество записей.
+
+        :returns: int
+        """
+        return self._count
+    #endregion
+
+    #region Доступ к данным
+    def column(self, index: int) -> memoryview:
+        """
+        Возвращает колонку как представление над отображением без копирования.
+
+        Представление нужно освободить (release или with) до close
+        и до добавления записей, требующих расширения файла.
+
+        :param index: Номер колонки
+        :type index: int
+        :returns: memoryview из float
+        :raises IndexError: Если колонки с таким номером нет.
+        """
+        columns = self._columns_for(self._dimension)
+        if not isinstance(index, int) or not 0 <= index < columns:
+            raise IndexError(f"Колонки {index} нет, всего колонок: {columns}")
+        start = self._column_offset(index)
+        with memoryview(self._mapping) as raw:
+            return raw[start:start + self._count * _ITEM_SIZE].cast("d")
+
+    def coordinates(self, axis: int) -> memoryview:
+        """
+        Возвращает колонку координаты axis без копирования.
+
+        :param axis: Номер оси
+        :type axis: int
+        :returns: memoryview из float
+        :raises IndexError: Если оси с таким номером нет.
+        """
+        if not isinstance(axis, int) or not 0 <= axis < self._dimension:
+            raise IndexError(f"Оси {axis} нет, размерность: {self._dimension}")
+        return self.column(axis)
+
+    def _check_id(self, id: int) -> int:
+        if not isinstance(id, int):
+            raise TypeError(f"Идентификатор записи должен быть целым числом, а не {type(id)}")
+        if id < 0:
+            id += self._count
+        if not 0 <= id < self._count:
+            raise IndexError(f"Записи {id} нет, всего записей: {self._count}")
+        return id
+
+    def _read_row(self, id: int) -> List[float]:
+        return [
+            _DOUBLE.unpack_from(self._mapping, self._column_offset(column) + id * _ITEM_SIZE)[0]
+            for column in range(self._columns_for(self._dimension))
+        ]
+
+    def __iter__(self) -> Iterator:
+        for id in range(self._count):
+            yield self[id]
+
+    @contextmanager
+    def _columns(self):
+        views = [self.column(index) for index in range(self._columns_for(self._dimension))]
+        try:
+            yield views
+        finally:
+            for view in views:
+                view.release()
+
+    def query_box(self, low: List[float], high: List[float]) -> List[int]:
+        """
+        Возвращает идентификаторы записей, координаты (центры) которых лежат в прямоугольнике [low, high].
+
+        :param low: Нижние границы по осям
+        :type low: List[float]
+        :param high: Верхние границы по осям
+        :type high: List[float]
+        :returns: List[int]
+        :raises DimensionMismatchPointException: Если размерность границ не совпадает.
+        """
+        if len(low) != self._dimension or len(high) != self._dimension:
+            raise DimensionMismatchPointException(message="Размерность границ и хранилища должны совпадать")
+        bounds = list(zip(low, high))
+        with self._columns() as columns:
+            return [
+                id for id, cords in enumerate(zip(*columns[:self._dimension]))
+                if all(lo <= value <= hi for value, (lo, hi) in zip(cords, bounds))
+            ]
+    #endregion
+
+    #region Добавление записей
+    def _row_of(self, object) -> List[float]:
+        raise NotImplementedError
+
+    def append(self, object) -> int:
+        """
+        Добавляет объект.
+
+        :param object: Объект для добавления
+        :returns: int - идентификатор записи
+        :raises TypeError: Если тип объекта не подходит хранилищу.
+        :raises DimensionMismatchPointException: Если размерность объекта и хранилища не совпадает.
+        """
+        return self._write_rows([self._row_of(object)]).start
+
+    def extend(self, objects: Iterable) -> range:
+        """
+        Добавляет несколько объектов. Все объекты проверяются до записи,
+        поэтому при ошибке хранилище не изменяется.
+
+        :param objects: Объекты для добавления
+        :type objects: Iterable
+        :returns: range идентификаторов добавленных записей
+        :raises TypeError: Если тип какого-либо объекта не подходит хранилищу.
+        :raises DimensionMismatchPointException: Если размерность какого-либо объекта и хранилища не совпадает.
+        """
+        return self._write_rows([self._row_of(object) for object in objects])
+
+    def _write_rows(self, rows: List[List[float]]) -> range:
+        self._reserve(self._count + len(rows))
+        first = self._count
+        for id, row in enumerate(rows, first):
+            for column, value in enumerate(row):
+                _DOUBLE.pack_into(self._mapping, self._column_offset(column) + id * _ITEM_SIZE, float(value))
+        self._count += len(rows)
+        self._write_header()
+        return range(first, self._count)
+
+    def _reserve(self, count: int):
+        if count <= self._capacity:
+            return
+        capacity = max(count, self._capacity * 2)
+        self._mapping.resize(_HEADER_SIZE + self._columns_for(self._dimension) * capacity * _ITEM_SIZE)
+        used = self._count * _ITEM_SIZE
+        for column in reversed(range(self._columns_for(self._dimension))):
+            old = _HEADER_SIZE + column * self._capacity * _ITEM_SIZE
+            new = _HEADER_SIZE + column * capacity * _ITEM_SIZE
+            self._mapping.move(new, old, used)
+        self._capacity = capacity
+        self._write_header()
+
+    def _column_offset(self, column: int) -> int:
+        return _HEADER_SIZE + column * self._capacity * _ITEM_SIZE
+
+    def _write_header(self):
+        _HEADER.pack_into(self._mapping, 0, _MAGIC, self._kind, self._dimension, self._count, self._capacity)
+    #endregion
+
+
+class PointStore(_ColumnStore):
+    """
+    Хранилище точек: по одной колонке на каждую координату.
+    """
+    _kind = _KIND_POINT
+
+    def _row_of(self, point: Point) -> List[float]:
+        if type(point) is not Point:
+            raise TypeError(f"Невозможно сохранить объект типа {type(point)} в хранилище точек")
+        if point.dimension != self._dimension:
+            raise DimensionMismatchPointException(message="Размерность точки и хранилища должны совпадать")
+        return point.values
+
+    def __getitem__(self, id: int) -> Point:
+        """
+        Возвращает точку по идентификатору.
+
+        :returns: Point
+        :raises IndexError: Если записи нет.
+        """
+        return Point(self._read_row(self._check_id(id)))
+
+    def query_ball(self, centre: Point, radius: Union[int, float]) -> List[int]:
+        """
+        Возвращает идентификаторы точек, лежащих в шаре (с той же точностью, что и Sphere.contains).
+
+        :param centre: Центр шара
+        :type centre: Point
+        :param radius: Радиус шара
+        :type radius: float
+        :returns: List[int]
+        :raises TypeError: Если центр - не точка.
+        :raises DimensionMismatchPointException: Если размерность центра и хранилища не совпадает.
+        """
+        if not isinstance(centre, Point):
+            raise TypeError(f"Центр шара не может быть объектом типа {type(centre)}")
+        if centre.dimension != self._dimension:
+            raise DimensionMismatchPointException(message="Размерность центра и хранилища должны совпадать")
+        cords = centre.values
+        with self._columns() as columns:
+            result = []
+            for id, values in enumerate(zip(*columns)):
+                distance = math.dist(values, cords)
+                if distance < radius or math.isclose(distance, radius, rel_tol=1e-9, abs_tol=1e-9):
+                    result.append(id)
+            return result
+
+
+class SphereStore(_ColumnStore):
+    """
+    Хранилище сфер: колонки координат центра, колонки конца радиус-вектора и колонка радиусов.
+
+    Сфера восстанавливается из тех же центра и конца радиус-вектора, что и у
+    исходного объекта, поэтому её радиус совпадает с исходным без потери точности.
+    """
+    _kind = _KIND_SPHERE
+
+    @classmethod
+    def _columns_for(cls, dimension: int) -> int:
+        return 2 * dimension + 1
+
+    def radii(self) -> memoryview:
+        """
+        Возвращает колонку радиусов без копирования.
+
+        :returns: memoryview из float
+        """
+        return self.column(2 * self._dimension)
+
+    def _row_of(self, sphere: Sphere) -> List[float]:
+        if not isinstance(sphere, Sphere):
+            raise TypeError(f"Невозможно сохранить объект типа {type(sphere)} в хранилище сфер")
+        if sphere.dimension != self._dimension:
+            raise DimensionMismatchPointException(message="Размерность сферы и хранилища должны совпадать")
+        return sphere.start_point.values + sphere.end_point.values + [sphere.radius]
+
+    def __getitem__(self, id: int) -> Sphere:
+        """
+        Возвращает сферу по идентификатору.
+
+        :returns: Sphere
+        :raises IndexError: Если записи нет.
+        """
+        row = self._read_row(self._check_id(id))
+        n = self._dimension
+        return Sphere(row[n:2 * n], row[:n])
+
+    def containing(self, point: Point) -> List[int]:
+        """
+        Возвращает идентификаторы сфер, шары которых содержат точку (как Sphere.contains).
+
+        :param point: Точка
+        :type point: Point
+        :returns: List[int]
+        :raises TypeError: Если объект - не точка.
+        :raises DimensionMismatchPointException: Если размерность точки и хранилища не совпадает.
+        """
+        if type(point) is not Point:
+            raise TypeError(f"Невозможно проверить содержание объекта типа {type(point)} в шаре")
+        if point.dimension != self._dimension:
+            raise DimensionMismatchPointException(message="Размерность точки и хранилища должны совпадать")
+        cords = point.values
+        with self._columns() as columns:
+            result = []
+            for id, (*centre, radius) in enumerate(zip(*columns[:self._dimension], columns[-1])):
+                distance = math.dist(centre, cords)
+                if distance < radius or math.isclose(distance, radius, rel_tol=1e-9, abs_tol=1e-9):
+                    result.append(id)
+            return result
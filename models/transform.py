@@ -0,0 +1,322 @@
+﻿from models.point import Point
+from models.vector import Vector
+from models.sphere import Sphere
+from models.exceptions import DimensionMismatchPointException
+from typing import Iterable, List, Union
+import math
+
+class AffineTransform():
+    def __init__(self, matrix: List[List[float]], offset: List[float] = None):
+        """
+        Создаёт аффинное преобразование x -> matrix * x + offset.
+
+        :param matrix: Квадратная матрица линейной части (N x N)
+        :type matrix: List[List[float]]
+        :param offset: Вектор сдвига (N координат)
+        :type offset: List[float]
+        :returns: AffineTransform
+        :raises TypeError: Если матрица или сдвиг - не списки чисел.
+        :raises ValueError: Если матрица пустая или не квадратная.
+        :raises DimensionMismatchPointException: Если размерность сдвига не совпадает с матрицей.
+        """
+        if not isinstance(matrix, list) or any(not isinstance(row, list) for row in matrix):
+            raise TypeError("Матрица преобразования должна быть списком строк")
+        size = len(matrix)
+        if size == 0:
+            raise ValueError("Матрица преобразования не может быть пустой")
+        if any(len(row) != size for row in matrix):
+            raise ValueError("Матрица преобразования должна быть квадратной")
+        if any(not isinstance(element, (int, float)) for row in matrix for element in row):
+            raise TypeError("Все элементы матрицы должны быть числами")
+
+        if offset is None:
+            offset = [0.0] * size
+        if not isinstance(offset, list) or any(not isinstance(element, (int, float)) for element in offset):
+            raise TypeError("Сдвиг должен быть списком чисел")
+        if len(offset) != size:
+            raise DimensionMismatchPointException(message="Размерность сдвига и матрицы преобразования должны совпадать")
+
+        self._matrix = [[*row] for row in matrix]
+        self._offset = [*offset]
+
+    @property
+    def dimension(self):
+        """
+        Возвращает размерность преобразования.
+
+        :returns: int
+        """
+        return len(self._offset)
+
+    @property
+    def matrix(self):
+        """
+        Возвращает копию линейной части.
+
+        :returns: List[List[float]]
+        """
+        return [[*row] for row in self._matrix]
+
+    @property
+    def offset(self):
+        """
+        Возвращает копию сдвига.
+
+        :returns: List[float]
+        """
+        return self._offset.copy()
+
+    #region Композиция
+    def then(self, other: "AffineTransform") -> "AffineTransform":
+        """
+        Композиция: сначала self, затем other. Результат - одно преобразование.
+
+        :param other: Следующее преобразование
+        :type other: AffineTransform
+        :returns: AffineTransform
+        :raises TypeError: Если other - не AffineTransform.
+        :raises DimensionMismatchPointException: Если размерности не совпадают.
+        """
+        if not isinstance(other, AffineTransform):
+            raise TypeError(f"Невозможно скомпоновать преобразование с объектом типа {type(other)}")
+        if other.dimension != self.dimension:
+            raise DimensionMismatchPointException(message="Невозможно скомпоновать преобразования разной размерности")
+        n = self.dimension
+        matrix = [[sum(other._matrix[i][k] * self._matrix[k][j] for k in range(n)) for j in range(n)] for i in range(n)]
+        offset = [sum(other._matrix[i][k] * self._offset[k] for k in range(n)) + other._offset[i] for i in range(n)]
+        return AffineTransform(matrix, offset)
+
+    def __matmul__(self, other: "AffineTransform") -> "AffineTransform":
+        """
+        Композиция в математической записи: (self @ other)(x) = self(other(x)).
+
+        :returns: AffineTransform
+        """
+        if not isinstance(other, AffineTransform):
+            return NotImplemented
+        return other.then(self)
+    #endregion
+
+    #region Применение
+    def apply_cords(self, values: List[float]) -> List[float]:
+        """
+        Применяет преобразование к списку координат.
+
+        :param values: Координаты
+        :type values: List[float]
+        :returns: List[float]
+        :raises DimensionMismatchPointException: Если размерность координат не совпадает.
+        """
+        if len(values) != self.dimension:
+            raise DimensionMismatchPointException(message="Размерность объекта и преобразования должны совпадать")
+        return [sum(m * v for m, v in zip(row, values)) + shift for row, shift in zip(self._matrix, self._offset)]
+
+    def uniform_scale(self) -> Union[float, None]:
+        """
+        Возвращает коэффициент подобия линейной части (M^T * M = s^2 * E), если он есть.
+
+        Скалярные произведения столбцов сравниваются относительно s^2, поэтому
+        проверка не зависит от масштаба (например, 1e-5 и 3e-5 - не подобие).
+
+        :returns: float, если преобразование - подобие, иначе - None
+        """
+        n = self.dimension
+        columns = [[self._matrix[i][j] for i in range(n)] for j in range(n)]
+        square = sum(c ** 2 for c in columns[0])
+        if square == 0.0:
+            return 0.0 if all(c == 0.0 for column in columns for c in column) else None
+        for i in range(n):
+            for j in range(i, n):
+                dot = sum(a * b for a, b in zip(columns[i], columns[j]))
+                if i == j and not math.isclose(dot, square, rel_tol=1e-9, abs_tol=0.0):
+                    return None
+                if i != j and abs(dot) / square > 1e-9:
+                    return None
+        return square ** 0.5
+
+    def apply(self, object: Point) -> Point:
+        """
+        Применяет преобразование к точке, вектору или сфере.
+
+        У вектора преобразуются начальная и конечная точки, у сферы - центр и конец радиуса.
+
+        :param object: Точка, вектор или сфера
+        :type object: Point
+        :returns: Объект того же типа
+        :raises TypeError: Если объект - не точка/вектор/сфера.
+        :raises ValueError: Если сфера преобразуется неравномерным масштабом.
+        :raises DimensionMismatchPointException: Если размерность объекта не совпадает.
+        """
+        return self.apply_many([object])[0]
+
+    def apply_many(self, objects: Iterable[Point]) -> List[Point]:
+        """
+        Применяет преобразование ко всем объектам за один проход.
+
+        :param objects: Точки, векторы и сферы
+        :type objects: Iterable[Point]
+        :returns: List[Point]
+        :raises TypeError: Если какой-либо объект - не точка/вектор/сфера.
+        :raises ValueError: Если среди объектов есть сфера, а преобразование - не подобие.
+        :raises DimensionMismatchPointException: Если размерность объекта не совпадает.
+        """
+        n = self.dimension
+        matrix = self._matrix
+        offset = self._offset
+        rows = list(zip(matrix, offset))
+        is_similarity = None
+        result = []
+        for object in objects:
+            if not isinstance(object, Point):
+                raise TypeError(f"Невозможно применить преобразование к объекту типа {type(object)}")
+            if object.dimension != n:
+                raise DimensionMismatchPointException(message="Размерность объекта и преобразования должны совпадать")
+
+            if isinstance(object, Sphere):
+                if is_similarity is None:
+                    is_similarity = self.uniform_scale() is not None
+                if not is_similarity:
+                    raise ValueError("Сферу можно преобразовать только поворотом, сдвигом и равномерным масштабом")
+
+            if isinstance(object, Vector):
+                start = object.start_point._values
+                end = object.end_point._values
+                new_start = [sum(m * v for m, v in zip(row, start)) + shift for row, shift in rows]
+                new_end = [sum(m * v for m, v in zip(row, end)) + shift for row, shift in rows]
+                result.append(object.__class__(new_end, new_start))
+            else:
+                values = object._values
+                result.append(object.__class__([sum(m * v for m, v in zip(row, values)) + shift for row, shift in rows]))
+        return result
+
+    def __call__(self, object: Point) -> Point:
+        """
+        Применяет преобразование к объекту (то же, что apply).
+
+        :returns: Point
+        """
+        return self.apply(object)
+    #endregion
+
+    #region Дополнительные операции
+    def __eq__(self, other: "AffineTransform"):
+        """
+        Сравнивает 2 преобразования по матрице и сдвигу.
+
+        :returns: bool
+        """
+        if not isinstance(other, AffineTransform) or other.dimension != self.dimension:
+            return False
+        return all(
+            math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-9)
+            for row_a, row_b in zip(self._matrix + [self._offset], other._matrix + [other._offset])
+            for a, b in zip(row_a, row_b)
+        )
+
+    def __str__(self):
+        """
+        Преобразует аффинное преобразование в строку для print.
+
+        :returns: str
+        """
+        rows = "; ".join(", ".join(map(str, row)) for row in self._matrix)
+        return f"AffineTransform[{self.dimension}](matrix=[{rows}], offset=({', '.join(map(str, self._offset))}))"
+    #endregion
+
+    #region CLS-методы
+    @classmethod
+    def identity(cls, dimension: int) -> "AffineTransform":
+        """
+        Создаёт тождественное преобразование.
+
+        :param dimension: Размерность
+        :type dimension: int
+        :returns: AffineTransform
+        :raises ValueError: Если размерность меньше единицы
+        """
+        if not isinstance(dimension, int):
+            raise TypeError("Тип размерности должен быть целочисленным значением")
+        if dimension < 1:
+            raise ValueError("Размерность должна быть >= 1")
+        return cls([[1.0 if i == j else 0.0 for j in range(dimension)] for i in range(dimension)])
+
+    @classmethod
+    def translation(cls, offset: List[float]) -> "AffineTransform":
+        """
+        Создаёт сдвиг на вектор offset.
+
+        :param offset: Координаты сдвига
+        :type offset: List[float]
+        :returns: AffineTransform
+        """
+        if not isinstance(offset, list):
+            raise TypeError("Сдвиг должен быть списком чисел")
+        return cls(cls.identity(len(offset))._matrix, offset)
+
+    @classmethod
+    def scaling(cls, factor: Union[int, float, List[float]], dimension: int = None) -> "AffineTransform":
+        """
+        Создаёт масштабирование относительно начала координат.
+
+        :param factor: Единый коэффициент или коэффициенты по каждой оси
+        :type factor: Union[int, float, List[float]]
+        :param dimension: Размерность (обязательна для единого коэффициента)
+        :type dimension: int
+        :returns: AffineTransform
+        :raises TypeError: Если коэффициент - не число и не список чисел.
+        """
+        if isinstance(factor, (int, float)):
+            if dimension is None:
+                raise TypeError("Для единого коэффициента масштаба нужно указать размерность")
+            factor = [factor] * dimension
+        if not isinstance(factor, list):
+            raise TypeError(f"Невозможно создать масштаб из объекта типа {type(factor)}")
+        size = len(factor)
+        return cls([[factor[i] if i == j else 0.0 for j in range(size)] for i in range(size)])
+
+    @classmethod
+    def rotation(cls, angle: Union[int, float], dimension: int = 2, axes: tuple = (0, 1)) -> "AffineTransform":
+        """
+        Создаёт поворот на угол angle (в радианах) в плоскости осей axes.
+
+        :param angle: Угол поворота в радианах
+        :type angle: float
+        :param dimension: Размерность
+        :type dimension: int
+        :param axes: Пара осей, задающая плоскость поворота
+        :type axes: tuple
+        :returns: AffineTransform
+        :raises ValueError: Если оси совпадают или выходят за размерность.
+        """
+        if not isinstance(angle, (int, float)):
+            raise TypeError("Угол поворота должен быть числом")
+        first, second = axes
+        if first == second or not (0 <= first < dimension and 0 <= second < dimension):
+            raise ValueError("Оси поворота должны быть различными и лежать в пределах размерности")
+        matrix = cls.identity(dimension)._matrix
+        cos, sin = math.cos(angle), math.sin(angle)
+        matrix[first][first] = cos
+        matrix[first][second] = -sin
+        matrix[second][first] = sin
+        matrix[second][second] = cos
+        return cls(matrix)
+
+    @classmethod
+    def compose(cls, *transforms: "AffineTransform") -> "AffineTransform":
+        """
+        Склеивает цепочку преобразований в одно (применяются слева направо).
+
+        :param transforms: Преобразования в порядке применения
+        :type transforms: AffineTransform
+        :returns: AffineTransform
+        :raises ValueError: Если цепочка пустая.
+        """
+        if len(transforms) == 0:
+            raise ValueError("Невозможно скомпоновать пустую цепочку преобразований")
+        result = transforms[0]
+        if not isinstance(result, AffineTransform):
+            raise TypeError(f"Невозможно скомпоновать преобразование с объектом типа {type(result)}")
+        for transform in transforms[1:]:
+            result = result.then(transform)
+        return result
+    #endregion
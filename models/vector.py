@@ -1,5 +1,6 @@
 ﻿from models.point import Point
 from models.exceptions import DimensionMismatchPointException
+from models.cache import memoized
 from typing import List, Union, Self, overload
 import math
 
@@ -185,6 +186,7 @@ class Vector(Point):
 
     #region Статические методы
     @staticmethod
+    @memoized("Vector.scalar_multiply")
     def scalar_multiply(a: "Vector", b: "Vector"):
         """
         Скалярное произведение векторов.
@@ -223,6 +225,7 @@ class Vector(Point):
         return sum(coord**2 for coord in vector.values)**0.5
     
     @staticmethod
+    @memoized("Vector.is_collinear")
     def is_collinear(a: "Vector", b: "Vector"):
         """
         Проверяет, являются ли векторы коллинеарными через свойство рангов матрицы
@@ -260,6 +263,7 @@ class Vector(Point):
         return True
 
     @staticmethod
+    @memoized("Vector.is_orthogonal")
     def is_orthogonal(a: "Vector", b: "Vector"):
         """
         Проверяет, являются ли векторы ортогональными через скалярное произведение векторов.
@@ -282,7 +286,8 @@ class Vector(Point):
         if length_1 != length_2:
             raise DimensionMismatchPointException(message="Невозможно проверить векторы на ортогональность.")
         
-        if math.isclose(Vector.scalar_multiply(a, b), 0.0, rel_tol=1e-9, abs_tol=1e-9):
+        # Без кэша: промежуточное скалярное произведение не должно вытеснять записи из LRU.
+        if math.isclose(Vector.scalar_multiply.__wrapped__(a, b), 0.0, rel_tol=1e-9, abs_tol=1e-9):
             return True
         
         return False